@@ -1,75 +1,163 @@
-from datetime import date, datetime, timedelta
-from typing import Dict, List, Optional, Union
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 from uuid import UUID
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, HTTPException, status
 
-from ...dependencies.session import get_session
-
-from ....schemas.document import DocumentCreate, DocumentUpdate
+from ....schemas.document import DocumentCreate, DocumentRead, DocumentUpdate
+from ....core.database import SessionManager
 from ....core.models import Document
+from ....core.settings import settings
+
+documents_router = APIRouter(
+    prefix="/documents", default_response_class=ORJSONResponse
+)
+
+# Bounded by the size of the rendered bodies, not the number of entries.
+documents_cache: TTLCache = TTLCache(
+    maxsize=settings.documents_cache_max_bytes,
+    ttl=settings.documents_cache_ttl,
+    getsizeof=lambda value: len(value[0]),
+)
+
 
-documents_router = APIRouter(prefix="/documents")
+# Bumped on every invalidation so a read that raced a write does not
+# store its pre-write body after the cache was cleared.
+documents_cache_generation = 0
+
+
+def invalidate_documents_cache() -> None:
+    global documents_cache_generation
+    documents_cache_generation += 1
+    documents_cache.clear()
 
 
 @documents_router.post("/")
-async def create_document(
-    document_data: DocumentCreate,
-    session: AsyncSession = Depends(get_session),
-):
-    new_document = Document(**document_data.model_dump())
-    if not await new_document.exist_pini(session):
-        new_document = await new_document.save(session)
-        return new_document
-    else:
-        return await new_document.get_by_pini(session)
+async def create_document(document_data: DocumentCreate):
+    async with SessionManager() as session:
+        document = Document()
+        new_document = await document.upsert_by_pini(
+            session, document_data.model_dump()
+        )
+    invalidate_documents_cache()
+    return new_document
+
+
+def _dump_model(model: BaseModel) -> Dict[str, Any]:
+    return model.model_dump()
+
+
+def _render_documents(data) -> tuple[bytes, str]:
+    # orjson encodes dicts, UUIDs and dates natively; the response schemas
+    # are handed back as plain dicts of those.
+    body = orjson.dumps(data, default=_dump_model)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    return body, etag
+
+
+async def _cached_response(
+    request: Request,
+    key: tuple,
+    load: Callable[[AsyncSession], Awaitable[Any]],
+) -> Response:
+    try:
+        body, etag = documents_cache[key]
+    except KeyError:
+        generation = documents_cache_generation
+        async with SessionManager(readonly=True) as session:
+            data = await load(session)
+        body, etag = _render_documents(data)
+        if generation == documents_cache_generation:
+            try:
+                documents_cache[key] = body, etag
+            except ValueError:  # a single body larger than the whole cache
+                pass
+
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=30"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @documents_router.get("/")
 async def get_documents(
-    id: UUID | None = None,
-    query: str | None = None,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: UUID | None = None,
 ):
-    document = Document()
-    if id:
-        document.id = id
-        saved_document = await document.get(session)
-        return saved_document
-    elif query:
-        saved_document = await document.search_by_query(session, query)
-        return saved_document
-    else:
-        all_saved_documents = await document.get_all(session)
-        return all_saved_documents
+    async def load(session: AsyncSession):
+        documents = await Document().get_all(session, limit=limit, after=cursor)
+        items = [DocumentRead.from_orm_fast(document) for document in documents]
+        return {
+            "items": items,
+            "next_cursor": items[-1].id if len(items) == limit else None,
+        }
 
+    return await _cached_response(request, ("all", limit, cursor), load)
 
-@documents_router.patch("/")
-async def update_document(
-    id: UUID,
-    document_data: DocumentUpdate,
-    session: AsyncSession = Depends(get_session),
-):
-    document = Document(id=id)
-    updated_document = await document._update(
-        session,
-        **document_data.model_dump(
-            exclude_none=True, exclude_unset=True, exclude_defaults=True
-        ),
-        examination_date=datetime.now(),
-        valid_date=datetime.now() + timedelta(days=365),
-    )
 
+@documents_router.get("/search")
+async def search_documents(request: Request, q: str = Query(..., min_length=1)):
+    async def load(session: AsyncSession):
+        documents = await Document().search_by_query(session, q)
+        return [DocumentRead.from_orm_fast(document) for document in documents]
+
+    return await _cached_response(request, ("search", q), load)
+
+
+async def _export_documents():
+    async with SessionManager() as session:
+        async for document in Document().iter_all(session):
+            yield orjson.dumps(document.to_dict()) + b"\n"
+
+
+@documents_router.get("/export")
+async def export_documents():
+    return StreamingResponse(_export_documents(), media_type="application/x-ndjson")
+
+
+@documents_router.get("/{id}")
+async def get_document(request: Request, id: UUID):
+    async def load(session: AsyncSession):
+        document = await Document(id=id).get(session)
+        if document is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="document not found"
+            )
+        return DocumentRead.from_orm_fast(document)
+
+    return await _cached_response(request, ("id", id), load)
+
+
+@documents_router.patch("/")
+async def update_document(id: UUID, document_data: DocumentUpdate):
+    async with SessionManager() as session:
+        document = Document(id=id)
+        updated_document = await document._update(
+            session,
+            **document_data.model_dump(exclude_unset=True, exclude_none=True),
+        )
+    if updated_document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="document not found"
+        )
+    invalidate_documents_cache()
     return updated_document
 
 
 @documents_router.delete("/")
-async def delete_document(
-    id: UUID,
-    session: AsyncSession = Depends(get_session),
-):
-    document = Document(id=id)
-    await document.get(session)
-
-    await document._delete(session)
+async def delete_document(id: UUID):
+    async with SessionManager() as session:
+        document = Document(id=id)
+        deleted = await document._delete(session)
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="document not found"
+        )
+    invalidate_documents_cache()
     return {"detail": "document deleted"}
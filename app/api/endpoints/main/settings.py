@@ -1,29 +1,80 @@
+import asyncio
 import random
-from fastapi import APIRouter
+from typing import Awaitable, Callable
+from fastapi import APIRouter, BackgroundTasks
 from fastapi.responses import JSONResponse
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app.api.endpoints.main.documents import invalidate_documents_cache
 from app.core.database import engine
-from app.core.models import Base
+from app.core.models import Base, trgm_extension
 
 settings_router = APIRouter()
 
+database_lock = asyncio.Lock()
+database_state = {"database": "ready"}
+
+
+def _compile_create_all() -> str:
+    dialect = postgresql.dialect()
+    statements = [trgm_extension]
+    for table in Base.metadata.sorted_tables:
+        statements.append(CreateTable(table, if_not_exists=True))
+        statements.extend(
+            CreateIndex(index, if_not_exists=True) for index in table.indexes
+        )
+    return ";\n".join(str(ddl.compile(dialect=dialect)) for ddl in statements)
+
+
+create_all_ddl = _compile_create_all()
+
+
+async def _create_all(conn: AsyncConnection):
+    raw_connection = await conn.get_raw_connection()
+    await raw_connection.driver_connection.execute(create_all_ddl)
+
+
+async def _drop_all(conn: AsyncConnection):
+    await conn.run_sync(Base.metadata.drop_all)
+
+
+async def _run_database_task(
+    state: str, *operations: Callable[[AsyncConnection], Awaitable[None]]
+):
+    async with database_lock:
+        database_state["database"] = "in progress"
+        try:
+            async with engine.begin() as conn:
+                for operation in operations:
+                    await operation(conn)
+        except Exception:
+            database_state["database"] = "failed"
+            raise
+        invalidate_documents_cache()
+        database_state["database"] = state
+
+
+@settings_router.get("/database/status")
+async def database_status():
+    return JSONResponse(content=database_state)
+
 
 @settings_router.get("/database/init")
-async def init_database():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-        return JSONResponse(content={"database": "initialized"})
+async def init_database(background_tasks: BackgroundTasks):
+    background_tasks.add_task(_run_database_task, "initialized", _create_all)
+    return JSONResponse(content={"database": "initializing"})
 
 
 @settings_router.get("/database/drop")
-async def drop_database():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-        return JSONResponse(content={"database": "droped"})
+async def drop_database(background_tasks: BackgroundTasks):
+    background_tasks.add_task(_run_database_task, "droped", _drop_all)
+    return JSONResponse(content={"database": "dropping"})
 
 
 @settings_router.get("/database/reload")
-async def reload_database():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
-        return JSONResponse(content={"database": "reloaded"})
+async def reload_database(background_tasks: BackgroundTasks):
+    background_tasks.add_task(
+        _run_database_task, "reloaded", _drop_all, _create_all
+    )
+    return JSONResponse(content={"database": "reloading"})
@@ -1,8 +1,14 @@
 # from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+import asyncio
+import hashlib
+import hmac
+import logging
 import subprocess
 import os
 
+from ....core.settings import settings
+
 # from ...dependencies.session import get_session
 # from ....core.models import (
 #     Resource,
@@ -18,6 +24,21 @@ import os
 
 github_router = APIRouter(prefix="/github")
 
+logger = logging.getLogger(__name__)
+
+git_lock = asyncio.Lock()
+
+
+def verify_signature(body: bytes, signature: str | None) -> bool:
+    if settings.github_webhook_secret is None or signature is None:
+        return False
+    digest = hmac.new(
+        settings.github_webhook_secret.get_secret_value().encode(),
+        body,
+        hashlib.sha256,
+    ).hexdigest()
+    return hmac.compare_digest(f"sha256={digest}", signature)
+
 
 @github_router.get(
     "/test",
@@ -34,12 +55,34 @@ async def test():
         return {"error": "Failed to get current directory"}
 
 
-@github_router.get(
+@github_router.post(
     "/push",
     status_code=status.HTTP_200_OK,
 )
-async def push():
-    result = subprocess.run(
-        ["/usr/bin/git", "pull"], capture_output=True, text=True, check=True
-    )
-    return {"message": "Repository updated successfully", "output": result.stdout}
+async def push(
+    request: Request,
+    x_hub_signature_256: str | None = Header(None),
+):
+    if not verify_signature(await request.body(), x_hub_signature_256):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="invalid signature"
+        )
+    # Queue behind a running pull rather than dropping this push: the
+    # running pull may have fetched before this commit landed.
+    async with git_lock:
+        process = await asyncio.create_subprocess_exec(
+            "/usr/bin/git",
+            "pull",
+            "--ff-only",
+            "--no-tags",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        logger.error("git pull failed: %s", stderr.decode())
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="repository update failed",
+        )
+    return {"message": "Repository updated successfully", "output": stdout.decode()}
@@ -1,6 +1,7 @@
+import anyio
 from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio.engine import create_async_engine
-from sqlalchemy.ext.asyncio.session import async_sessionmaker
+from sqlalchemy.ext.asyncio.session import AsyncSession, async_sessionmaker
 from .settings import settings
 
 DRIVER = settings.database_driver.get_secret_value()
@@ -22,6 +23,11 @@ engine = create_async_engine(
     pool_timeout=settings.database_engine_pool_timeout,
     pool_recycle=settings.database_engine_pool_recycle,
     pool_pre_ping=settings.database_engine_pool_pre_ping,
+    query_cache_size=settings.database_engine_query_cache_size,
+    connect_args={
+        "prepared_statement_cache_size": settings.database_engine_prepared_statement_cache_size,
+        "server_settings": settings.database_engine_server_settings,
+    },
 )
 
 async_session = async_sessionmaker(
@@ -29,3 +35,28 @@ async_session = async_sessionmaker(
     autoflush=settings.database_session_autoflush,
     expire_on_commit=settings.database_session_expire_on_commit,
 )
+
+
+readonly_session = async_sessionmaker(
+    engine.execution_options(isolation_level="AUTOCOMMIT"),
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+class SessionManager:
+    def __init__(self, readonly: bool = False) -> None:
+        self.factory = readonly_session if readonly else async_session
+        self.session: AsyncSession | None = None
+
+    async def __aenter__(self) -> AsyncSession:
+        self.session = self.factory()
+        return self.session
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self.session is not None:
+            # Shielded so a cancelled request (e.g. a client dropping a
+            # streaming export) still returns the connection to the pool.
+            with anyio.CancelScope(shield=True):
+                await self.session.close()
+            self.session = None
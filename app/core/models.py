@@ -3,20 +3,26 @@ from __future__ import annotations
 import uuid
 from enum import Enum
 from datetime import date, time, datetime
-from typing import Any, BinaryIO, List, Optional, Union
+from typing import Any, Literal, AsyncIterator, BinaryIO, List, Optional, Sequence, Union
 
 from sqlalchemy import (
+    DDL,
     INTEGER,
     Column,
+    Computed,
     ForeignKey,
+    Index,
     Table,
     UniqueConstraint,
-    exists,
     update,
+    delete,
     extract,
     and_,
-    or_,
     func,
+    lambda_stmt,
+    event,
+    inspect,
+    literal_column,
 )
 from sqlalchemy.dialects.postgresql import (
     BOOLEAN,
@@ -29,9 +35,12 @@ from sqlalchemy.dialects.postgresql import (
     UUID,
     VARCHAR,
     TIMESTAMP,
+    insert,
 )
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncAttrs
 from sqlalchemy.future import select
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -48,215 +57,200 @@ class Base(DeclarativeBase, AsyncAttrs):
     __abstract__ = True
     id: Any
 
-    async def _setattr_instance(self, obj):
-        if obj:
-            for key, value in vars(obj).items():
-                if key != "_sa_instance_state":
-                    setattr(self, key, value)
-        return obj
-
-    async def _execute_search(
-        self,
-        session: AsyncSession,
-        condition: Optional[Any] = None,
-        options: Optional[List[Any]] = None,
-    ):
-        query = select(self.__class__)
-
-        if condition is not None:
-            query = query.filter(condition)
-
-        if options is not None:
-            query = query.options(*options)
-
-        result = await session.execute(query)
-        return result.scalars().all()
-
-    async def _execute_unique_search(
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if not cls.__dict__.get("__abstract__", False):
+            cls._base_select = select(cls)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            attr.key: self.__dict__[attr.key]
+            for attr in self.__mapper__.column_attrs
+            if attr.key in self.__dict__
+        }
+
+    def _primary_key_value(self, condition) -> Any:
+        if (
+            isinstance(condition, BinaryExpression)
+            and condition.operator is operators.eq
+            and isinstance(condition.right, BindParameter)
+            and condition.right.value is not None
+            and condition.left.compare(self.__class__.__table__.c.id)
+        ):
+            return condition.right.value
+        return None
+
+    async def query(
         self,
         session: AsyncSession,
-        condition: Optional[Any] = None,
-        options: Optional[List[Any]] = None,
+        *,
+        where: Optional[Any] = None,
+        options: Sequence[Any] = (),
+        unique: bool = False,
+        unique_strategy: Literal["rows", "objects"] = "objects",
+        one: bool = False,
+        pk: Optional[Any] = None,
     ):
-        query = select(self.__class__)
-
-        if options is not None:
-            query = query.options(*options)
-
-        if condition is not None:
-            query = query.filter(condition)
-
-        result = await session.execute(query)
-
-        return result.unique().scalars().all()
-
-    async def save(self, session: AsyncSession):
+        if pk is None and one:
+            pk = self._primary_key_value(where)
+        if pk is not None:
+            return await self.by_id(session, pk, *options)
+
+        cls = self.__class__
+        statement = lambda_stmt(lambda: select(cls))
+        if options:
+            statement += lambda s: s.options(*options)
+        if where is not None:
+            statement += lambda s: s.where(where)
+        # "objects" dedups hydrated instances, as joined eager loads of
+        # collections require; "rows" is an opt-in SELECT DISTINCT for
+        # plain queries.
+        if unique and unique_strategy == "rows":
+            statement += lambda s: s.distinct()
+
+        result = await session.execute(statement)
+        if unique and unique_strategy == "objects":
+            result = result.unique()
+        scalars = result.scalars()
+        return scalars.one_or_none() if one else scalars.all()
+
+    def stage(self, session: AsyncSession):
         session.add(self)
-        await session.commit()
-        await session.refresh(self)
         return self
 
-    async def exist(self, session: AsyncSession, condition) -> bool | None:
-        result = await session.execute(select(exists(self.__class__).where(condition)))
-        return result.scalar()
-
-    async def search(self, session: AsyncSession, filter: Any):
-        return await self._execute_search(session, condition=filter)
-
-    async def search_with_options(
-        self, session: AsyncSession, options: Any, condition: Any
-    ):
-        return await self._execute_search(
-            session, condition=condition, options=[options]
-        )
-
-    async def search_with_multi_filters(
-        self, session: AsyncSession, filters: List[Any]
-    ):
-        condition = or_(*filters)
-        return await self._execute_search(session, condition=condition)
-
-    async def search_with_multi_options(
-        self, session: AsyncSession, options: List[Any], filter: Any
-    ):
-        return await self._execute_search(session, condition=filter, options=options)
-
-    async def search_with_options_and_multi_filters(
-        self, session: AsyncSession, options: Any, filters: List[Any]
-    ):
-        condition = or_(*filters)
-        return await self._execute_search(
-            session, condition=condition, options=[options]
-        )
-
-    async def search_with_multi_options_and_multi_filters(
-        self, session: AsyncSession, options: List[Any], filters: List[Any]
-    ):
-        condition = or_(*filters)
-        return await self._execute_unique_search(
-            session, condition=condition, options=options
+    async def save(self, session: AsyncSession):
+        state = inspect(self)
+        if state.pending or state.has_identity:
+            self.stage(session)
+            await session.commit()
+            return self
+        result = await session.execute(
+            insert(self.__class__).values(**self.to_dict()).returning(self.__class__)
         )
-
-    async def get(self, session: AsyncSession):
-        obj = await session.get(self.__class__, self.id)
-        await self._setattr_instance(obj)
+        obj = result.scalar_one()
+        await session.commit()
         return obj
 
-    async def get_with_filter(self, session: AsyncSession, filter):
-        result = await session.execute(select(self.__class__).filter(filter))
-        obj = result.scalar_one_or_none()
-        return await self._setattr_instance(obj)
-
-    async def get_with_filter_with_options(
-        self, session: AsyncSession, filter, options
-    ):
-        result = await session.execute(
-            select(self.__class__).filter(filter).options(options)
-        )
-        obj = result.scalar_one_or_none()
-        return await self._setattr_instance(obj)
+    async def bulk_insert(self, session: AsyncSession, objs: List[Any]) -> None:
+        await session.execute(insert(self.__class__), [obj.to_dict() for obj in objs])
+        await session.commit()
 
-    async def get_with_filter_with_multi_options(
-        self, session: AsyncSession, filter, options
-    ):
+    async def exist(self, session: AsyncSession, condition) -> bool:
         result = await session.execute(
-            select(self.__class__).filter(filter).options(options)
+            select(literal_column("1"))
+            .select_from(self.__class__)
+            .where(condition)
+            .limit(1)
         )
-        obj = result.scalar_one_or_none()
-        return await self._setattr_instance(obj)
+        return result.scalar() is not None
 
-    async def get_where(self, session: AsyncSession, condition):
-        result = await session.execute(select(self.__class__).where(condition))
-        obj = result.scalar_one_or_none()
-        return await self._setattr_instance(obj)
+    async def by_id(self, session: AsyncSession, pk: Any, *options: Any):
+        return await session.get(self.__class__, pk, options=options)
 
-    async def get_where_with_options(self, session: AsyncSession, condition, options):
-        result = await session.execute(
-            select(self.__class__).where(condition).options(options)
-        )
-        obj = result.scalar_one_or_none()
-        return await self._setattr_instance(obj)
+    async def get(self, session: AsyncSession):
+        return await self.by_id(session, self.id)
 
-    async def get_where_with_multi_options(
-        self, session: AsyncSession, condition, options: List[Any]
+    async def get_all(
+        self,
+        session: AsyncSession,
+        limit: Optional[int] = None,
+        after: Optional[Any] = None,
     ):
-        result = await session.execute(
-            select(self.__class__).options(*options).filter(condition)
-        )
-        obj = result.scalar_one_or_none()
-        await self._setattr_instance(obj)
-        return obj
-
-    async def get_all(self, session: AsyncSession):
-        result = await session.execute(select(self.__class__))
+        query = self._base_select
+        if limit is not None or after is not None:
+            query = query.order_by(self.__class__.id)
+        if after is not None:
+            query = query.where(self.__class__.id > after)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await session.execute(query)
         return result.scalars().all()
 
-    async def get_all_where(self, session: AsyncSession, condition):
-        result = await session.execute(select(self.__class__).where(condition))
-        return list(result.scalars().all())
-
-    async def get_all_where_with_options(
-        self, session: AsyncSession, condition, options: List[Any]
-    ):
-        result = await session.execute(
-            select(self.__class__).where(condition).options(*options)
-        )
-        return list(result.scalars().all())
-
-    async def get_all_where_with_multi_options(
-        self, session: AsyncSession, condition, options: List[Any]
-    ):
-        result = await session.execute(
-            select(self.__class__).where(condition).options(*options)
-        )
-        return list(result.scalars().all())
-
-    async def get_all_with_options(self, session: AsyncSession, options):
-        result = await session.execute(select(self.__class__).options(options))
+    def iter_all(self, session: AsyncSession, chunk: int = 500) -> AsyncIterator[Any]:
+        return self.iter_all_where(session, None, chunk)
+
+    async def get_all_eager(self, session: AsyncSession, *relationships: str):
+        mapper = inspect(self.__class__)
+        options = []
+        for name in relationships:
+            attribute = getattr(self.__class__, name)
+            if mapper.relationships[name].uselist:
+                options.append(selectinload(attribute))
+            else:
+                options.append(joinedload(attribute))
+        result = await session.execute(self._base_select.options(*options))
         return list(result.scalars().all())
 
-    async def get_all_with_multi_options(
-        self, session: AsyncSession, options: List[Any]
-    ):
-        stmt = select(self.__class__).options(*options)
-        result = await session.execute(stmt)
-        return list(result.scalars().all())
+    async def iter_all_where(
+        self, session: AsyncSession, condition, chunk: int = 1000
+    ) -> AsyncIterator[Any]:
+        query = self._base_select.execution_options(yield_per=chunk)
+        if condition is not None:
+            query = query.where(condition)
+        result = await session.stream(query)
+        async for partition in result.scalars().partitions():
+            for obj in partition:
+                yield obj
 
     async def _update(self, session: AsyncSession, **kwargs):
         result = await session.execute(
-            update(self.__class__).where(self.__class__.id == self.id).values(**kwargs)
+            update(self.__class__)
+            .where(self.__class__.id == self.id)
+            .values(**kwargs)
+            .returning(self.__class__)
         )
+        obj = result.scalar_one_or_none()
         await session.commit()
-        return result
+        return obj
 
     async def _delete(self, session: AsyncSession) -> bool:
-        instance = await session.get(self.__class__, self.id)
-        if not instance:
-            return False
-        await session.delete(instance)
+        if any(rel.cascade.delete for rel in self.__mapper__.relationships):
+            instance = await self.by_id(session, self.id)
+            if instance is None:
+                return False
+            await session.delete(instance)
+        else:
+            result = await session.execute(
+                delete(self.__class__).where(self.__class__.id == self.id)
+            )
+            if result.rowcount == 0:
+                return False
         await session.commit()
         return True
 
     async def delete_all(self, session: AsyncSession) -> bool:
-        await session.delete(self.__class__)
+        await session.execute(
+            delete(self.__class__),
+            execution_options={"synchronize_session": False},
+        )
         await session.commit()
         return True
 
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index(
+            "documents_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     organization: Mapped[str] = mapped_column(VARCHAR(255))
     full_name: Mapped[str] = mapped_column(VARCHAR(255))
-    pini: Mapped[str] = mapped_column(VARCHAR(14))
-    passport_series: Mapped[str] = mapped_column(VARCHAR(9))
+    pini: Mapped[str] = mapped_column(VARCHAR(14), unique=True)
+    passport_series: Mapped[str] = mapped_column(VARCHAR(9), index=True)
     birth_date: Mapped[date] = mapped_column(DATE, nullable=False)
     registration_address: Mapped[str] = mapped_column(VARCHAR(255))
     work_address: Mapped[str] = mapped_column(VARCHAR(255), nullable=True)
-    examination_date: Mapped[date] = mapped_column(DATE, nullable=True)
+    examination_date: Mapped[date] = mapped_column(
+        DATE, nullable=True, onupdate=func.current_date()
+    )
 
     a_type: Mapped[bool] = mapped_column(BOOLEAN, default=None, nullable=True)
     b_type: Mapped[bool] = mapped_column(BOOLEAN, default=None, nullable=True)
@@ -267,23 +261,70 @@ class Document(Base):
     trolleybus_type: Mapped[bool] = mapped_column(BOOLEAN, default=None, nullable=True)
     hired_type: Mapped[bool] = mapped_column(BOOLEAN, default=None, nullable=True)
     special_note: Mapped[str] = mapped_column(VARCHAR(255), default=None, nullable=True)
-    valid_date: Mapped[date] = mapped_column(DATE, nullable=True)
+    valid_date: Mapped[date] = mapped_column(
+        DATE, nullable=True, onupdate=func.current_date() + 365
+    )
     commission_director: Mapped[str] = mapped_column(VARCHAR(255))
     finish: Mapped[bool] = mapped_column(BOOLEAN, default=False)
+    search_text: Mapped[str] = mapped_column(
+        TEXT,
+        Computed("full_name || ' ' || pini || ' ' || passport_series", persisted=True),
+        deferred=True,
+    )
 
     async def get_by_pini(self, session: AsyncSession):
-        return await self.get_where(session, self.__class__.pini == self.pini)
-
-    async def exist_pini(self, session: AsyncSession):
-        return await self.exist(session, self.__class__.pini == self.pini)
-
-    async def search_by_query(self, session: AsyncSession, query: str):
-        filters = [
-            self.__class__.full_name.ilike(f"%{query}%"),
-            self.__class__.pini.ilike(f"%{query}%"),
-            self.__class__.passport_series.ilike(f"%{query}%"),
-        ]
-        return await self.search_with_multi_filters(session, filters)
+        pini = self.pini
+        statement = lambda_stmt(lambda: select(Document).where(Document.pini == pini))
+        result = await session.execute(statement)
+        return result.scalar_one_or_none()
+
+    async def get_by_pini_minimal(self, session: AsyncSession):
+        pini = self.pini
+        statement = lambda_stmt(
+            lambda: select(Document.id, Document.full_name, Document.finish).where(
+                Document.pini == pini
+            )
+        )
+        result = await session.execute(statement)
+        return result.first()
+
+    async def exist_pini(self, session: AsyncSession) -> bool:
+        pini = self.pini
+        statement = lambda_stmt(
+            lambda: select(literal_column("1")).where(Document.pini == pini).limit(1)
+        )
+        result = await session.execute(statement)
+        return result.scalar() is not None
+
+    async def upsert_by_pini(self, session: AsyncSession, values: dict[str, Any]):
+        statement = insert(self.__class__).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.__class__.pini],
+            set_={"pini": statement.excluded.pini},
+        ).returning(self.__class__)
+        result = await session.execute(
+            statement, execution_options={"populate_existing": True}
+        )
+        obj = result.scalar_one()
+        await session.commit()
+        return obj
+
+    async def search_by_query(
+        self, session: AsyncSession, query: str, limit: int = 50
+    ):
+        pattern = f"%{query}%"
+        statement = lambda_stmt(
+            lambda: select(Document)
+            .where(Document.search_text.ilike(pattern))
+            .order_by(func.similarity(Document.search_text, query).desc())
+            .limit(limit)
+        )
+        result = await session.execute(statement)
+        return result.scalars().all()
+
+
+trgm_extension = DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+event.listen(Base.metadata, "before_create", trgm_extension)
 
 
 # class Image(Base):
@@ -1,4 +1,5 @@
-from typing import List
+from functools import lru_cache
+from typing import Dict, List
 from ipaddress import IPv4Address
 from pydantic import SecretStr, Secret
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -25,14 +26,27 @@ class Settings(BaseSettings):
 
     database_engine_echo: bool = False
     database_engine_future: bool = True
-    database_engine_pool_size: int = 5
+    database_engine_pool_size: int = 20
     database_engine_max_overflow: int = 10
     database_engine_pool_timeout: int = 30
-    database_engine_pool_recycle: int = 1800
+    database_engine_pool_recycle: int = 3600
     database_engine_pool_pre_ping: bool = True
+    database_engine_prepared_statement_cache_size: int = 1024
+    database_engine_query_cache_size: int = 1200
+    database_engine_server_settings: Dict[str, str] = {"jit": "off"}
 
     database_session_autoflush: bool = False
     database_session_expire_on_commit: bool = False
 
+    github_webhook_secret: SecretStr | None = None
 
-settings = Settings()  # type: ignore
+    documents_cache_max_bytes: int = 32 * 1024 * 1024
+    documents_cache_ttl: int = 60
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    return Settings()  # type: ignore
+
+
+settings = get_settings()
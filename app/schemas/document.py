@@ -1,134 +1,135 @@
-from typing import Optional
+from typing import Annotated, Any, Optional
 from uuid import UUID
-from datetime import date, datetime
-from enum import Enum
-from pydantic import (
-    BaseModel,
-    Field,
-    EmailStr,
-    FilePath,
-    ConfigDict,
-    SecretStr,
-    StringConstraints,
-    constr,
-)
+from datetime import date
+from annotated_types import MaxLen
+from pydantic import BaseModel, Field, ConfigDict
 
 
-config = ConfigDict(from_attributes=True)
+Str255 = Annotated[Optional[str], MaxLen(255)]
+Str14 = Annotated[Optional[str], MaxLen(14)]
+Str9 = Annotated[Optional[str], MaxLen(9)]
 
 
-class DocumentBase(BaseModel):
-    organization: Optional[str] = Field(
-        None,
+Organization = Annotated[
+    Str255,
+    Field(
         title="Organization",
         description="Name of the organization the document belongs to.",
-        max_length=255,
         examples=["My Organization"],
-    )
-    full_name: Optional[str] = Field(
-        None,
+    ),
+]
+
+FullName = Annotated[
+    Str255,
+    Field(
         title="Full Name",
         description="Full name of the individual the document refers to.",
-        max_length=255,
         examples=["John Doe"],
-    )
-    pini: Optional[str] = Field(
-        None,
+    ),
+]
+
+Pini = Annotated[
+    Str14,
+    Field(
         title="PINI",
         description="Personal Identification Number (PINI) of the individual.",
-        max_length=14,
+        pattern=r"^\d{14}$",
         examples=["12345678901234"],
-    )
-    passport_series: Optional[str] = Field(
-        None,
+    ),
+]
+
+PassportSeries = Annotated[
+    Str9,
+    Field(
         title="Passport Series",
         description="Passport series of the individual.",
-        max_length=9,
-        examples=["AA123456"],
-    )
-    birth_date: date = Field(
-        datetime.now(),
-        title="Birth Date",
-        description="Date of birth of the individual.",
-        examples=["1990-01-01"],
-    )
-    registration_address: Optional[str] = Field(
-        None,
+        pattern=r"^[A-Z]{2}\d{7}$",
+        examples=["AA1234567"],
+    ),
+]
+
+_birth_date = Field(
+    title="Birth Date",
+    description="Date of birth of the individual.",
+    examples=["1990-01-01"],
+)
+BirthDate = Annotated[date, _birth_date]
+OptionalBirthDate = Annotated[Optional[date], _birth_date]
+
+RegistrationAddress = Annotated[
+    Str255,
+    Field(
         title="Registration Address",
         description="Registered address of the individual.",
-        max_length=255,
         examples=["123 Main Street, City, Country"],
-    )
-    work_address: Optional[str] = Field(
-        None,
+    ),
+]
+
+WorkAddress = Annotated[
+    Str255,
+    Field(
         title="Work Address",
         description="Workplace address of the individual.",
-        max_length=255,
         examples=["456 Work Blvd, City, Country"],
-    )
-    examination_date: Optional[date] = Field(
-        None,
+    ),
+]
+
+ExaminationDate = Annotated[
+    Optional[date],
+    Field(
         title="Examination Date",
         description="Date when the individual underwent an examination.",
         examples=["2024-12-01"],
-    )
+    ),
+]
 
-    a_type: Optional[bool] = Field(
-        None,
-        title="Health Type A",
-        description="Health type of the individual for category A.",
-        examples=[True],
-    )
-    b_type: Optional[bool] = Field(
-        None,
-        title="Health Type B",
-        description="Health type of the individual for category B.",
-        examples=[None],
-    )
-    c_type: Optional[bool] = Field(
-        None,
-        title="Health Type C",
-        description="Health type of the individual for category C.",
-        examples=[True, False],
-    )
-    d_type: Optional[bool] = Field(
-        None,
-        title="Health Type D",
-        description="Health type of the individual for category D.",
-        examples=[True, False],
-    )
-    e_type: Optional[bool] = Field(
-        None,
-        title="Health Type E",
-        description="Health type of the individual for category E.",
-        examples=[True, False],
-    )
-    tram_type: Optional[bool] = Field(
-        None,
-        title="Health Type Tram",
-        description="Health type of the individual for tram category.",
-        examples=[True, False],
-    )
-    trolleybus_type: Optional[bool] = Field(
-        None,
-        title="Health Type Trolleybus",
-        description="Health type of the individual for trolleybus category.",
-        examples=[True, False],
-    )
-    hired_type: Optional[bool] = Field(
-        None,
-        title="Health Type Hired",
-        description="Health type of the individual for hired category.",
-        examples=[True, False],
-    )
-
-    commission_director: Optional[str] = Field(
-        None,
+CommissionDirector = Annotated[
+    Str255,
+    Field(
         title="Commission Director",
         description="Name of the director of the commission that issued the document.",
-        max_length=255,
         examples=["Director Name"],
-    )
+    ),
+]
+
+HealthType = Annotated[
+    Optional[bool],
+    Field(
+        description="Health type of the individual for the given category.",
+        examples=[True, False],
+    ),
+]
+
+
+class _DocumentFields(BaseModel):
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+    full_name: FullName = None
+    pini: Pini = None
+    passport_series: PassportSeries = None
+    registration_address: RegistrationAddress = None
+    commission_director: CommissionDirector = None
+
+
+class _DocumentHealthFields(BaseModel):
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+
+    work_address: WorkAddress = None
+
+    a_type: HealthType = None
+    b_type: HealthType = None
+    c_type: HealthType = None
+    d_type: HealthType = None
+    e_type: HealthType = None
+    tram_type: HealthType = None
+    trolleybus_type: HealthType = None
+    hired_type: HealthType = None
+
+
+class DocumentBase(_DocumentFields, _DocumentHealthFields):
+    organization: Organization = None
+    birth_date: OptionalBirthDate = None
+    examination_date: ExaminationDate = None
     finish: Optional[bool] = Field(
         False,
         title="Finish Status",
@@ -136,164 +137,35 @@ class DocumentBase(BaseModel):
         examples=[True, False],
     )
 
+    @classmethod
+    def from_orm_fast(cls, obj: Any) -> "DocumentBase":
+        # Trusted rows straight from the database: skip re-validation.
+        return cls.model_construct(
+            **{field: getattr(obj, field, None) for field in cls.model_fields}
+        )
 
-class DocumentCreate(BaseModel):
-    organization: Optional[str] = Field(
-        None,
-        title="Organization",
-        description="Name of the organization the document belongs to.",
-        max_length=255,
-        examples=["My Organization"],
-    )
-    full_name: Optional[str] = Field(
-        None,
-        title="Full Name",
-        description="Full name of the individual the document refers to.",
-        max_length=255,
-        examples=["John Doe"],
-    )
-    pini: Optional[str] = Field(
-        None,
-        title="PINI",
-        description="Personal Identification Number (PINI) of the individual.",
-        max_length=14,
-        examples=["12345678901234"],
-    )
-    passport_series: Optional[str] = Field(
-        None,
-        title="Passport Series",
-        description="Passport series of the individual.",
-        max_length=9,
-        examples=["AA123456"],
-    )
-    birth_date: date = Field(
-        datetime.now(),
-        title="Birth Date",
-        description="Date of birth of the individual.",
-        examples=["1990-01-01"],
-    )
-    registration_address: Optional[str] = Field(
-        None,
-        title="Registration Address",
-        description="Registered address of the individual.",
-        max_length=255,
-        examples=["123 Main Street, City, Country"],
-    )
 
-    commission_director: Optional[str] = Field(
-        None,
-        title="Commission Director",
-        description="Name of the director of the commission that issued the document.",
-        max_length=255,
-        examples=["Director Name"],
-    )
+class DocumentRead(DocumentBase):
+    model_config = ConfigDict(frozen=True)
 
+    id: UUID
+    special_note: Optional[str] = None
+    valid_date: Optional[date] = None
 
-class DocumentUpdate(BaseModel):
-    full_name: Optional[str] = Field(
-        None,
-        title="Full Name",
-        description="Full name of the individual the document refers to.",
-        max_length=255,
-        examples=["John Doe"],
-    )
-    pini: Optional[str] = Field(
-        None,
-        title="PINI",
-        description="Personal Identification Number (PINI) of the individual.",
-        max_length=14,
-        examples=["12345678901234"],
-    )
-    passport_series: Optional[str] = Field(
-        None,
-        title="Passport Series",
-        description="Passport series of the individual.",
-        max_length=9,
-        examples=["AA123456"],
-    )
-    birth_date: date = Field(
-        datetime.now(),
-        title="Birth Date",
-        description="Date of birth of the individual.",
-        examples=["1990-01-01"],
-    )
-    registration_address: Optional[str] = Field(
-        None,
-        title="Registration Address",
-        description="Registered address of the individual.",
-        max_length=255,
-        examples=["123 Main Street, City, Country"],
-    )
-    work_address: Optional[str] = Field(
-        None,
-        title="Work Address",
-        description="Workplace address of the individual.",
-        max_length=255,
-        examples=["456 Work Blvd, City, Country"],
-    )
 
-    a_type: Optional[bool] = Field(
-        None,
-        title="Health Type A",
-        description="Health type of the individual for category A.",
-        examples=[None],
-    )
-    b_type: Optional[bool] = Field(
-        None,
-        title="Health Type B",
-        description="Health type of the individual for category B.",
-        examples=[None],
-    )
-    c_type: Optional[bool] = Field(
-        None,
-        title="Health Type C",
-        description="Health type of the individual for category C.",
-        examples=[None],
-    )
-    d_type: Optional[bool] = Field(
-        None,
-        title="Health Type D",
-        description="Health type of the individual for category D.",
-        examples=[None],
-    )
-    e_type: Optional[bool] = Field(
-        None,
-        title="Health Type E",
-        description="Health type of the individual for category E.",
-        examples=[None],
-    )
-    tram_type: Optional[bool] = Field(
-        None,
-        title="Health Type Tram",
-        description="Health type of the individual for tram category.",
-        examples=[None],
-    )
-    trolleybus_type: Optional[bool] = Field(
-        None,
-        title="Health Type Trolleybus",
-        description="Health type of the individual for trolleybus category.",
-        examples=[None],
-    )
-    hired_type: Optional[bool] = Field(
-        None,
-        title="Health Type Hired",
-        description="Health type of the individual for hired category.",
-        examples=[None],
-    )
-    special_note: Optional[str] = Field(
+class DocumentCreate(_DocumentFields):
+    organization: Organization = None
+    birth_date: BirthDate
+
+
+class DocumentUpdate(_DocumentFields, _DocumentHealthFields):
+    birth_date: OptionalBirthDate = None
+    special_note: Str255 = Field(
         None,
         title="Special note",
         description="Special note",
-        max_length=255,
         examples=["Kozoynak bilan mukun"],
     )
-    commission_director: Optional[str] = Field(
-        None,
-        title="Commission Director",
-        description="Name of the director of the commission that issued the document.",
-        max_length=255,
-        examples=["Director Name"],
-    )
     finish: Optional[bool] = Field(
         None,
         title="Finish Status",
@@ -1,20 +1,33 @@
+from typing import Collection, List
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 
-from app.core.settings import settings
+from app.core.settings import get_settings
 from app.api.routers.main import main_router
 
-app = FastAPI(
-    title=settings.title,
-    description=settings.description,
-    version=settings.version,
-)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.allow_origins,
-    allow_credentials=settings.allow_credentials,
-    allow_methods=settings.allow_methods,
-    allow_headers=settings.allow_headers,
-)
-app.include_router(main_router)
+
+def _allow_list(values: List[str]) -> Collection[str]:
+    return values if "*" in values else frozenset(values)
+
+
+def create_app() -> FastAPI:
+    settings = get_settings()
+    app = FastAPI(
+        title=settings.title,
+        description=settings.description,
+        version=settings.version,
+    )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=_allow_list(settings.allow_origins),
+        allow_credentials=settings.allow_credentials,
+        allow_methods=_allow_list(settings.allow_methods),
+        allow_headers=settings.allow_headers,
+    )
+    app.include_router(main_router)
+    return app
+
+
+app = create_app()